@@ -0,0 +1,188 @@
+"""基于天天基金净值序列的基金表现与持仓估值，使用 NumPy 对多只基金、多个日期批量计算"""
+
+import datetime
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+from beancount.core import data
+from beancount.core.amount import Amount
+
+from beancount_extras_cn.price import eastmoney
+
+
+@dataclass
+class NavSeries:
+    # 基金代码，同时作为 beancount 商品名称，如 F000001
+    ticker: str
+    # 净值日期，datetime64[D]，升序
+    dates: np.ndarray
+    # 单位净值 DWJZ
+    nav: np.ndarray
+    # 累计净值 LJJZ
+    acc_nav: np.ndarray
+    # 日增长率（小数），已包含分红，即复权收益率
+    growth: np.ndarray
+
+
+@dataclass
+class NavPanel:
+    # 基金代码，对应矩阵的行
+    tickers: List[str]
+    # 所有基金净值日期的并集，对应矩阵的列
+    dates: np.ndarray
+    # 单位净值矩阵，非交易日沿用前值，首个净值日期之前为 nan
+    nav: np.ndarray
+    # 累计净值矩阵，填充规则同 nav
+    acc_nav: np.ndarray
+    # 日增长率矩阵，非交易日为 0，首个净值日期之前为 nan
+    growth: np.ndarray
+    # 当日是否有该基金的净值记录
+    traded: np.ndarray
+
+
+def _to_float(value) -> float:
+    """将接口返回的字符串转换为浮点数，空值转换为 nan"""
+    if value is None or value == "":
+        return np.nan
+    return float(value)
+
+
+def load_nav_series(ticker: str, records: Sequence[Dict]) -> NavSeries:
+    """
+    将天天基金净值记录转换为 NumPy 序列
+    :param ticker: 基金代码
+    :param records: eastmoney.Source.get_nav_records 返回的净值记录
+    :return: 按日期升序排列的净值序列
+    """
+    records = sorted(records, key=lambda record: record["FSRQ"])
+    dates = np.array([record["FSRQ"] for record in records], dtype="datetime64[D]")
+    nav = np.array([_to_float(record["DWJZ"]) for record in records])
+    acc_nav = np.array([_to_float(record["LJJZ"]) for record in records])
+    growth = np.array([_to_float(record["JZZZL"]) for record in records]) / 100
+
+    # 缺少日增长率时，用累计净值的增量除以前一日单位净值补齐，分红已计入累计净值
+    implied = np.full(len(records), np.nan)
+    implied[1:] = (acc_nav[1:] - acc_nav[:-1]) / nav[:-1]
+    growth = np.where(np.isnan(growth), implied, growth)
+    return NavSeries(ticker, dates, nav, acc_nav, growth)
+
+
+def align(series: Sequence[NavSeries]) -> NavPanel:
+    """
+    将多只基金的净值序列对齐到同一日期轴上
+    :param series: 净值序列
+    :return: 以基金为行、日期为列的净值面板
+    """
+    dates = np.unique(np.concatenate([s.dates for s in series]))
+    shape = (len(series), len(dates))
+    nav = np.full(shape, np.nan)
+    acc_nav = np.full(shape, np.nan)
+    growth = np.full(shape, np.nan)
+    traded = np.zeros(shape, dtype=bool)
+    for row, s in enumerate(series):
+        # 每个日期对应的最近一条净值记录
+        index = np.searchsorted(s.dates, dates, side="right") - 1
+        started = index >= 0
+        index = index.clip(0)
+        traded[row] = started & (s.dates[index] == dates)
+        nav[row] = np.where(started, s.nav[index], np.nan)
+        acc_nav[row] = np.where(started, s.acc_nav[index], np.nan)
+        growth[row] = np.where(traded[row], s.growth[index], np.where(started, 0.0, np.nan))
+    return NavPanel([s.ticker for s in series], dates, nav, acc_nav, growth, traded)
+
+
+def fetch_panel(tickers: Sequence[str], start_date=None, end_date=None,
+                price_source: Optional[eastmoney.Source] = None) -> NavPanel:
+    """
+    从天天基金网获取多只基金的完整净值序列并对齐
+    :param tickers: 基金代码，需要包含六位基金代码
+    :param start_date: 开始日期
+    :param end_date: 结束日期
+    :param price_source: 天天基金数据源，为空时新建
+    :return: 净值面板
+    """
+    price_source = price_source or eastmoney.Source()
+    return align([
+        load_nav_series(ticker, price_source.get_nav_records(ticker, start_date, end_date))
+        for ticker in tickers
+    ])
+
+
+def adjusted_nav(panel: NavPanel) -> np.ndarray:
+    """复权净值，以每只基金区间内首个净值日期为 1"""
+    growth = panel.growth.copy()
+    started = ~np.isnan(growth) | ~np.isnan(panel.nav)
+    # 首日的增长率相对于区间外的净值，不计入区间收益
+    first = started & ~np.concatenate([np.zeros((len(growth), 1), dtype=bool), started[:, :-1]], axis=1)
+    growth[first | np.isnan(growth)] = 0.0
+    result = np.cumprod(1 + growth, axis=1)
+    result[~started] = np.nan
+    return result
+
+
+def cumulative_returns(panel: NavPanel) -> np.ndarray:
+    """区间累计复权收益率"""
+    return adjusted_nav(panel) - 1
+
+
+def drawdowns(panel: NavPanel) -> np.ndarray:
+    """每个日期相对于此前复权净值最高点的回撤，取值为非正数"""
+    adjusted = adjusted_nav(panel)
+    return adjusted / np.fmax.accumulate(adjusted, axis=1) - 1
+
+
+def max_drawdowns(panel: NavPanel) -> np.ndarray:
+    """每只基金区间内的最大回撤"""
+    return np.nanmin(drawdowns(panel), axis=1)
+
+
+def holding_values(panel: NavPanel, units) -> np.ndarray:
+    """
+    按单位净值计算持仓市值
+    :param panel: 净值面板
+    :param units: 持有份额，形状为 (基金数,) 表示固定份额，或 (基金数, 日期数) 表示每日份额
+    :return: 持仓市值矩阵
+    """
+    units = np.asarray(units, dtype=float)
+    if units.ndim == 1:
+        units = units[:, np.newaxis]
+    return panel.nav * units
+
+
+def _decimal(value: float, places: int) -> Decimal:
+    return Decimal(f"{value:.{places}f}")
+
+
+def price_entries(panel: NavPanel, currency: str = "CNY", units=None) -> List[data.Price]:
+    """
+    将净值面板转换为 beancount Price 指令，收益率、回撤、持仓市值写入元数据
+    :param panel: 净值面板
+    :param currency: 计价货币
+    :param units: 持有份额，参见 holding_values，为空时不输出持仓市值
+    :return: 按日期、基金代码排序的 Price 指令
+    """
+    returns = cumulative_returns(panel)
+    drawdown = drawdowns(panel)
+
+    metrics = [
+        ("acc-nav", panel.acc_nav, 4),
+        ("daily-return", panel.growth, 6),
+        ("cumulative-return", returns, 6),
+        ("drawdown", drawdown, 6),
+    ]
+    if units is not None:
+        metrics.append(("market-value", holding_values(panel, units), 2))
+
+    entries = []
+    for row, col in zip(*np.nonzero(panel.traded & ~np.isnan(panel.nav))):
+        meta = data.new_metadata(__name__, 0)
+        for key, matrix, places in metrics:
+            if not np.isnan(matrix[row, col]):
+                meta[key] = _decimal(matrix[row, col], places)
+        date: datetime.date = panel.dates[col].astype(datetime.date)
+        amount = Amount(_decimal(panel.nav[row, col], 4), currency)
+        entries.append(data.Price(meta, date, panel.tickers[row], amount))
+    entries.sort(key=lambda entry: (entry.date, entry.currency))
+    return entries
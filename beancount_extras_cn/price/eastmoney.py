@@ -4,7 +4,7 @@ import json
 import re
 from datetime import datetime
 from decimal import Decimal
-from typing import Optional, Dict
+from typing import Optional, Dict, List
 
 import requests
 from beancount.prices import source
@@ -17,8 +17,8 @@ class EastMoneyError(ValueError):
     """An error from the EastMoney API."""
 
 
-def parse_response(response) -> Dict:
-    """Process as response from EastMoney.
+def parse_result(response) -> Dict:
+    """Decode the JSONP payload of a response from EastMoney.
     Raises:
       EastMoneyError: If there is an error in the response.
     """
@@ -30,7 +30,15 @@ def parse_response(response) -> Dict:
     records = result["Data"]["LSJZList"]
     if len(records) == 0:
         raise EastMoneyError("No data returned from EastMoney, ensure that the symbol is correct")
-    return records[0]
+    return result
+
+
+def parse_response(response) -> Dict:
+    """Process as response from EastMoney.
+    Raises:
+      EastMoneyError: If there is an error in the response.
+    """
+    return parse_result(response)["Data"]["LSJZList"][0]
 
 
 class Source(source.Source):
@@ -57,6 +65,41 @@ class Source(source.Source):
         """See contract in beanprice.source.Source."""
         return self._get_price_series(ticker, time)
 
+    def get_nav_records(self, ticker: str, start_date=None, end_date=None, page_size: int = 20) -> List[Dict]:
+        """
+        获取日期区间内的全部净值记录，包含单位净值 DWJZ、累计净值 LJJZ 和日增长率 JZZZL
+        :param ticker: 股票/基金代码，需要包含六位基金代码
+        :param start_date: 开始日期，为空时不限制
+        :param end_date: 结束日期，为空时不限制
+        :param page_size: 每页记录数
+        :return: 按日期升序排列的净值记录
+        """
+        fund_code: str = self.fund_code_regex.search(ticker).group()
+        payload = {
+            "callback": "thecallback",
+            "fundCode": fund_code,
+            "pageSize": page_size,
+        }
+        if start_date is not None:
+            payload["startDate"] = start_date.strftime("%Y-%m-%d")
+        if end_date is not None:
+            payload["endDate"] = end_date.strftime("%Y-%m-%d")
+        url = "https://api.fund.eastmoney.com/f10/lsjz"
+
+        records: List[Dict] = []
+        page_index = 1
+        while True:
+            payload["pageIndex"] = page_index
+            response: requests.Response = self.http.get(url, params=payload)
+            result = parse_result(response)
+            page = result["Data"]["LSJZList"]
+            records.extend(page)
+            if len(page) < page_size or len(records) >= result["TotalCount"]:
+                break
+            page_index += 1
+        records.sort(key=lambda record: record["FSRQ"])
+        return records
+
     def _get_price_series(self, ticker: str, time=None) -> Optional[source.SourcePrice]:
         """
         获取价格序列
@@ -10,5 +10,6 @@ setup(
     packages=find_packages(),
     install_requires=[
         "beancount~=2.3.0",
+        "numpy",
     ]
 )
@@ -0,0 +1,91 @@
+import datetime
+import unittest
+from decimal import Decimal
+from unittest import mock
+
+import numpy as np
+from requests import Session
+
+from beancount_extras_cn.price import analytics, eastmoney
+from tests.price.test_eastmoney import MockResponse
+
+
+def _record(date, nav, acc_nav, growth):
+    return {"FSRQ": date, "DWJZ": nav, "LJJZ": acc_nav, "JZZZL": growth}
+
+
+FUND_A = [
+    _record("2022-09-05", "1.1000", "1.1000", "10.00"),
+    _record("2022-09-01", "1.0000", "1.0000", ""),
+    _record("2022-09-06", "0.9900", "0.9900", "-10.00"),
+    _record("2022-09-02", "1.0000", "1.0000", "0.00"),
+]
+# 2022-09-05 每份分红 0.1，单位净值下降但累计净值不变
+FUND_B = [
+    _record("2022-09-02", "2.0000", "2.0000", "1.00"),
+    _record("2022-09-05", "1.9000", "2.0000", ""),
+]
+
+
+class AnalyticsTest(unittest.TestCase):
+
+    def setUp(self):
+        self.panel = analytics.align([
+            analytics.load_nav_series("F000001", FUND_A),
+            analytics.load_nav_series("F000002", FUND_B),
+        ])
+
+    def test_load_nav_series(self):
+        series = analytics.load_nav_series("F000002", FUND_B)
+        np.testing.assert_array_equal(np.array(["2022-09-02", "2022-09-05"], dtype="datetime64[D]"), series.dates)
+        np.testing.assert_allclose([0.01, 0.0], series.growth)
+
+    def test_align(self):
+        self.assertEqual(["F000001", "F000002"], self.panel.tickers)
+        self.assertEqual(4, len(self.panel.dates))
+        np.testing.assert_array_equal([np.nan, 2.0, 1.9, 1.9], self.panel.nav[1])
+        np.testing.assert_array_equal([False, True, True, False], self.panel.traded[1])
+        np.testing.assert_array_equal([np.nan, 0.01, 0.0, 0.0], self.panel.growth[1])
+
+    def test_cumulative_returns(self):
+        returns = analytics.cumulative_returns(self.panel)
+        np.testing.assert_allclose([0.0, 0.0, 0.1, -0.01], returns[0])
+        np.testing.assert_allclose([np.nan, 0.0, 0.0, 0.0], returns[1])
+
+    def test_drawdowns(self):
+        np.testing.assert_allclose([0.0, 0.0, 0.0, -0.1], analytics.drawdowns(self.panel)[0])
+        np.testing.assert_allclose([-0.1, 0.0], analytics.max_drawdowns(self.panel))
+
+    def test_holding_values(self):
+        values = analytics.holding_values(self.panel, [100, 10])
+        np.testing.assert_allclose([100.0, 100.0, 110.0, 99.0], values[0])
+        np.testing.assert_allclose([np.nan, 20.0, 19.0, 19.0], values[1])
+
+    def test_price_entries(self):
+        entries = analytics.price_entries(self.panel, units=[100, 10])
+        self.assertEqual(6, len(entries))
+        entry = entries[-1]
+        self.assertEqual(datetime.date(2022, 9, 6), entry.date)
+        self.assertEqual("F000001", entry.currency)
+        self.assertEqual(Decimal("0.9900"), entry.amount.number)
+        self.assertEqual("CNY", entry.amount.currency)
+        self.assertEqual(Decimal("-0.100000"), entry.meta["daily-return"])
+        self.assertEqual(Decimal("-0.010000"), entry.meta["cumulative-return"])
+        self.assertEqual(Decimal("-0.100000"), entry.meta["drawdown"])
+        self.assertEqual(Decimal("99.00"), entry.meta["market-value"])
+        self.assertNotIn("daily-return", entries[0].meta)
+
+    def test_get_nav_records_paging(self):
+        pages = [
+            MockResponse('{"Data": {"LSJZList": [%s, %s]}, "TotalCount": 3}' % (
+                '{"FSRQ": "2022-09-06"}', '{"FSRQ": "2022-09-05"}')),
+            MockResponse('{"Data": {"LSJZList": [%s]}, "TotalCount": 3}' % '{"FSRQ": "2022-09-02"}'),
+        ]
+        with mock.patch.object(Session, 'get', side_effect=pages) as get:
+            records = eastmoney.Source().get_nav_records('F000001', page_size=2)
+        self.assertEqual(2, get.call_count)
+        self.assertEqual(["2022-09-02", "2022-09-05", "2022-09-06"], [r["FSRQ"] for r in records])
+
+
+if __name__ == '__main__':
+    unittest.main()